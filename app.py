@@ -1,23 +1,55 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
 import json
+import gzip
+import functools
+import hashlib
 import time
 import logging
 import random
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple, Callable
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator, NamedTuple
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
+import orjson
 import requests
-from flask import Flask, jsonify, request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
 
 try:
     import cohere
 except Exception:
     cohere = None
 
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except Exception:
+    HTMLParser = None
+
 # -------- Configuration --------
 APP_VERSION = "1.0.0"
 IST = ZoneInfo("Asia/Kolkata")
@@ -26,11 +58,36 @@ BASE_DIR = Path(__file__).parent.resolve()
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-CACHE_FILE = DATA_DIR / "cache.json"
+# One small JSON file per IST date: data/cache/YYYY-MM-DD.json
+CACHE_DIR = DATA_DIR / "cache"
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_TTL_DAYS = 14
+# Held by whoever generates a day's payload (a /daily miss or the warmer)
+GENERATION_LOCK_FILE = DATA_DIR / "generate.lock"
+# A /daily miss waits this long for another worker's generation before doing its own
+GENERATION_LOCK_WAIT = 15.0
+GENERATION_LOCK_POLL = 0.1
+_GENERATION_LOCK = threading.Lock()
+HISTORY_DB = DATA_DIR / "history.db"
+# Legacy JSON history, imported into HISTORY_DB on first use
 HISTORY_FILE = DATA_DIR / "history.json"
+HISTORY_KEEP_PER_DAY = 200
 LIST_FILE = BASE_DIR / "list.txt"
 ANNIVERSARIES_FILE = BASE_DIR / "anniversaries.txt"
 
+# Shared worker pool for overlapping independent network calls.
+# Created lazily per process: an executor inherited across fork (uWSGI,
+# gunicorn --preload) believes it still has idle workers and never runs jobs.
+_POOL_STATE: Dict[str, Any] = {"pool": None, "pid": None}
+_POOL_LOCK = threading.Lock()
+# How long to wait for a background SERP call once the main work is done
+SERP_JOIN_TIMEOUT = 5.0
+
+# Pooled HTTP connections (SerpAPI, BookMyShow) reused across requests.
+# Transport-level retries are off; with_retries handles retrying.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=0, backoff_factor=0)))
+
 # Keys: set in environment on PythonAnywhere
 #   SERPAPI_API_KEY
 #   COHERE_API_KEY
@@ -43,6 +100,14 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
+# -------- Precompiled patterns --------
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+_ANNIV_SEP_RE = re.compile(r"\s*&\s*|\s*-\s*|\s+and\s+")
+_BMS_TITLE_RE = re.compile(r'"title"\s*:\s*"([^"]+)"')
+_BMS_HREF_RE = re.compile(r'href="[^"]*?/movie/[^"]*?"', re.IGNORECASE)
+_BMS_CLOSE_A_RE = re.compile(r"</a\s*>", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+
 # -------- Utilities --------
 def now_ist() -> datetime:
     return datetime.now(IST)
@@ -55,57 +120,332 @@ def weekday_ist_str() -> str:
 
 def read_json_file(path: Path, default: Any) -> Any:
     try:
-        if path.exists():
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logging.error(f"Failed to read JSON {path}: {e}")
     return default
 
-def write_json_file(path: Path, obj: Any) -> None:
+def write_json_file(path: Path, obj: Any) -> bool:
+    # Write to a temp file and swap it in so readers never see a partial file.
+    # The temp name is unique per process/thread so concurrent writers don't clobber it.
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
     try:
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+        tmp.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, path)
+        return True
     except Exception as e:
         logging.error(f"Failed to write JSON {path}: {e}")
+        tmp.unlink(missing_ok=True)
+        return False
 
 def normalize_text(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", s.lower().strip())
+    return _NORMALIZE_RE.sub("", s.lower().strip())
 
-def get_cache() -> Dict[str, Any]:
-    return read_json_file(CACHE_FILE, default={})
+def worker_pool() -> ThreadPoolExecutor:
+    with _POOL_LOCK:
+        if _POOL_STATE["pool"] is None or _POOL_STATE["pid"] != os.getpid():
+            _POOL_STATE["pool"] = ThreadPoolExecutor(max_workers=4)
+            _POOL_STATE["pid"] = os.getpid()
+        return _POOL_STATE["pool"]
 
-def set_cache(date_key: str, payload: Dict[str, Any]) -> None:
-    cache = get_cache()
-    cache[date_key] = payload
-    write_json_file(CACHE_FILE, cache)
+def file_mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-def get_history() -> Dict[str, List[str]]:
-    # history maps weekday -> list of normalized strings
-    hist = read_json_file(HISTORY_FILE, default={})
-    for day in ["MONDAY","TUESDAY","WEDNESDAY","THURSDAY","FRIDAY","SATURDAY","SUNDAY"]:
-        hist.setdefault(day, [])
-    return hist
+def cache_path(date_key: str) -> Path:
+    return CACHE_DIR / f"{date_key}.json"
+
+def get_cached(date_key: str) -> Optional[Dict[str, Any]]:
+    return read_json_file(cache_path(date_key), default=None)
+
+def set_cache(date_key: str, payload: Dict[str, Any]) -> bool:
+    return write_json_file(cache_path(date_key), payload)
+
+def clear_cache() -> None:
+    with _TODAY_LOCK:
+        _TODAY_CACHE["date"] = None
+    for f in CACHE_DIR.glob("*.json"):
+        f.unlink(missing_ok=True)
+
+def prune_cache(max_age_days: int = CACHE_TTL_DAYS) -> None:
+    # Drop per-date cache files older than the TTL (by mtime)
+    cutoff = time.time() - max_age_days * 86400
+    for f in CACHE_DIR.glob("*.json"):
+        try:
+            if f.stat().st_mtime < cutoff:
+                f.unlink()
+        except OSError as e:
+            logging.warning(f"Failed to prune cache file {f}: {e}")
+
+@contextmanager
+def local_generation_lock(timeout: float) -> Iterator[bool]:
+    # In-process stand-in for generation_lock where flock isn't usable
+    acquired = _GENERATION_LOCK.acquire(timeout=timeout) if timeout > 0 else _GENERATION_LOCK.acquire(False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            _GENERATION_LOCK.release()
 
-def save_history(hist: Dict[str, List[str]]) -> None:
-    # keep last 200 entries per day
-    for k in hist:
-        if isinstance(hist[k], list) and len(hist[k]) > 200:
-            hist[k] = hist[k][-200:]
-    write_json_file(HISTORY_FILE, hist)
+@contextmanager
+def generation_lock(timeout: float = 0) -> Iterator[bool]:
+    """
+    Cross-worker lock around generating a day's payload (flock on
+    GENERATION_LOCK_FILE). Waits up to timeout seconds and yields False if
+    another holder still has it. Falls back to an in-process lock where
+    fcntl is unavailable or the filesystem doesn't support flock.
+    """
+    if fcntl is None:
+        with local_generation_lock(timeout) as acquired:
+            yield acquired
+        return
+    deadline = time.monotonic() + timeout
+    flock_error: Optional[OSError] = None
+    try:
+        lock = GENERATION_LOCK_FILE.open("a")
+    except OSError as e:
+        lock, flock_error = None, e
+    if lock is not None:
+        with lock:
+            acquired = False
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(GENERATION_LOCK_POLL)
+                except OSError as e:
+                    # e.g. ENOLCK on a network filesystem
+                    flock_error = e
+                    break
+            if flock_error is None:
+                # Released when the file is closed
+                yield acquired
+                return
+    logging.warning(f"Cannot lock {GENERATION_LOCK_FILE} ({flock_error}); using an in-process generation lock")
+    with local_generation_lock(max(deadline - time.monotonic(), 0)) as acquired:
+        yield acquired
+
+# Process-local memo of today's cached payload and its serialized response.
+# "mtime" ties it to the on-disk cache file so a reset/regeneration by another
+# worker is noticed with a single stat; "snapshot" is the rendered response
+# for the current payload. All updates happen under _TODAY_LOCK.
+_TODAY_CACHE: Dict[str, Any] = {"date": None, "mtime": None, "payload": None, "snapshot": None}
+_TODAY_LOCK = threading.Lock()
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 512
+
+class TodaySnapshot(NamedTuple):
+    """One rendering of the memoized payload; never mutated once published (except the encoded cache)."""
+    overlay: Tuple[List[str], List[Dict[str, Any]]]  # (birthdays, anniversaries) it was rendered with
+    body: bytes
+    etag: str
+    last_modified: datetime
+    encoded: Dict[str, bytes]  # compressed copies of body per Content-Encoding, built on first use
+
+def memo_today(date_key: str, payload: Dict[str, Any]) -> None:
+    mtime = file_mtime_ns(cache_path(date_key))
+    with _TODAY_LOCK:
+        _TODAY_CACHE.update(date=date_key, mtime=mtime, payload=payload, snapshot=None)
+
+def load_today_memo(date_key: str) -> bool:
+    """Ensure the memo holds date_key's cached payload; False if nothing is cached."""
+    mtime = file_mtime_ns(cache_path(date_key))
+    with _TODAY_LOCK:
+        if mtime is None:
+            _TODAY_CACHE["date"] = None
+            return False
+        if _TODAY_CACHE["date"] == date_key and _TODAY_CACHE["mtime"] == mtime:
+            return True
+    payload = get_cached(date_key)
+    if payload is None:
+        return False
+    with _TODAY_LOCK:
+        _TODAY_CACHE.update(date=date_key, mtime=mtime, payload=payload, snapshot=None)
+    return True
+
+def render_today(birthdays: List[str], anniversaries: List[Dict[str, Any]]) -> TodaySnapshot:
+    """Snapshot of the cache-hit response for the memoized day, re-rendered only when the overlay changes."""
+    overlay = (birthdays, anniversaries)
+    with _TODAY_LOCK:
+        snap = _TODAY_CACHE["snapshot"]
+        if snap is None or snap.overlay != overlay:
+            payload = dict(_TODAY_CACHE["payload"])
+            # Always attach latest birthdays (not stored in cache to avoid staleness if list.txt changes midday)
+            payload["birthdays_today"] = birthdays
+            # Always attach latest anniversaries too
+            payload["anniversaries_today"] = anniversaries
+            # Mark as cache hit for client visibility
+            payload["cache_hit"] = True
+            body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+            # Newest of the inputs that shape the body, so it agrees across workers
+            mtimes = [_TODAY_CACHE["mtime"], file_mtime_ns(LIST_FILE), file_mtime_ns(ANNIVERSARIES_FILE)]
+            last_modified = datetime.fromtimestamp(max(t for t in mtimes if t is not None) / 1e9, tz=timezone.utc)
+            snap = TodaySnapshot(
+                overlay=overlay,
+                body=body,
+                etag=hashlib.blake2b(body, digest_size=16).hexdigest(),
+                last_modified=last_modified,
+                encoded={},
+            )
+            _TODAY_CACHE["snapshot"] = snap
+    return snap
+
+def preferred_encoding(body: bytes) -> Optional[str]:
+    if len(body) < COMPRESS_MIN_BYTES:
+        return None
+    accept = request.accept_encodings
+    if brotli is not None and accept["br"] > 0:
+        return "br"
+    if accept["gzip"] > 0:
+        return "gzip"
+    return None
+
+def encoded_today(snap: TodaySnapshot, encoding: str) -> bytes:
+    # Compress the snapshot's body once, not per request
+    if encoding not in snap.encoded:
+        body = snap.body
+        snap.encoded[encoding] = brotli.compress(body, quality=5) if encoding == "br" else gzip.compress(body, compresslevel=6, mtime=0)
+    return snap.encoded[encoding]
+
+def today_response(birthdays: List[str], anniversaries: List[Dict[str, Any]]) -> Response:
+    """Cache-hit response with ETag/Last-Modified; 304 with no body when the client is current."""
+    # Everything below comes from this one snapshot, so body and validators always match
+    snap = render_today(birthdays, anniversaries)
+    body = snap.body
+    etag = snap.etag
+    encoding = preferred_encoding(body)
+    if encoding:
+        body = encoded_today(snap, encoding)
+        # Each representation gets its own strong validator
+        etag = f"{etag}-{encoding}"
+    resp = app.response_class(body, mimetype="application/json")
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.set_etag(etag)
+    resp.last_modified = snap.last_modified
+    return resp.make_conditional(request)
+
+# History: one row per (weekday, normalized text), ordered by insert time.
+# The connection is opened lazily per process (safe across pre-fork servers)
+# and shared by threads under _DB_LOCK.
+_DB_STATE: Dict[str, Any] = {"conn": None, "pid": None}
+_DB_LOCK = threading.Lock()
+
+def open_history_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(HISTORY_DB, check_same_thread=False)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            " day TEXT NOT NULL, norm TEXT NOT NULL, ts INTEGER NOT NULL,"
+            " PRIMARY KEY (day, norm))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS history_day_ts ON history (day, ts)")
+        if conn.execute("SELECT 1 FROM history LIMIT 1").fetchone() is None:
+            migrate_history_json(conn)
+    except sqlite3.Error:
+        # Don't leak a half-set-up connection; the next call retries
+        conn.close()
+        raise
+    return conn
+
+def migrate_history_json(conn: sqlite3.Connection) -> None:
+    # One-time import of the legacy history.json (weekday -> list of normalized strings)
+    hist = read_json_file(HISTORY_FILE, default={})
+    rows = []
+    base = time.time_ns()
+    for day, norms in hist.items():
+        if isinstance(norms, list):
+            rows.extend((day, norm, base + i) for i, norm in enumerate(norms[-HISTORY_KEEP_PER_DAY:]))
+    if rows:
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO history (day, norm, ts) VALUES (?, ?, ?)", rows)
+        logging.info(f"Imported {len(rows)} history entries from {HISTORY_FILE}")
+
+def history_db() -> sqlite3.Connection:
+    # Call with _DB_LOCK held
+    if _DB_STATE["conn"] is None or _DB_STATE["pid"] != os.getpid():
+        _DB_STATE["conn"] = open_history_db()
+        _DB_STATE["pid"] = os.getpid()
+    return _DB_STATE["conn"]
 
 def is_repeated(day: str, text: str) -> bool:
+    # History is best-effort: if the DB is unavailable, treat everything as new
     norm = normalize_text(text)
-    hist = get_history()
-    return norm in set(hist.get(day, []))
+    try:
+        with _DB_LOCK:
+            row = history_db().execute("SELECT 1 FROM history WHERE day = ? AND norm = ?", (day, norm)).fetchone()
+    except sqlite3.Error as e:
+        logging.error(f"Failed to read history {HISTORY_DB}: {e}")
+        return False
+    return row is not None
 
 def add_history(day: str, text: str) -> None:
     norm = normalize_text(text)
-    hist = get_history()
-    if norm not in hist.get(day, []):
-        hist[day].append(norm)
-        save_history(hist)
+    try:
+        with _DB_LOCK:
+            conn = history_db()
+            with conn:
+                cur = conn.execute("INSERT OR IGNORE INTO history (day, norm, ts) VALUES (?, ?, ?)", (day, norm, time.time_ns()))
+                if cur.rowcount:
+                    # keep last 200 entries per day
+                    conn.execute(
+                        "DELETE FROM history WHERE day = ? AND norm NOT IN"
+                        " (SELECT norm FROM history WHERE day = ? ORDER BY ts DESC LIMIT ?)",
+                        (day, day, HISTORY_KEEP_PER_DAY),
+                    )
+    except sqlite3.Error as e:
+        logging.error(f"Failed to write history {HISTORY_DB}: {e}")
+
+# Parsed list/anniversary files, keyed by (parser, path) -> (mtime_ns, size, result)
+_PARSE_CACHE: Dict[Tuple[str, str], Tuple[int, int, Any]] = {}
+
+def mtime_cached(fn: Callable[[Path], Any]):
+    """Memoize a file parser until the file's mtime or size changes."""
+    @functools.wraps(fn)
+    def wrapper(path: Path) -> Any:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return fn(path)
+        key = (fn.__name__, str(path))
+        hit = _PARSE_CACHE.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            return hit[2]
+        result = fn(path)
+        _PARSE_CACHE[key] = (st.st_mtime_ns, st.st_size, result)
+        return result
+    return wrapper
 
+def split_entry_line(raw: bytes, header: str) -> Optional[Tuple[str, List[Any]]]:
+    """
+    Split a raw "left:DD/MM[/YYYY]" line into (left, date parts).
+    Pure-ASCII lines stay bytes (int() accepts them); the rest are decoded so
+    strip()/int() handle Unicode whitespace (e.g. NBSP).
+    Returns None for blank, header and colon-less lines.
+    """
+    if raw.isascii():
+        line, colon, slash, hdr = raw.strip(), b":", b"/", header.encode("ascii")
+    else:
+        line, colon, slash, hdr = raw.decode("utf-8").strip(), ":", "/", header
+    if not line or line.lower().startswith(hdr) or colon not in line:
+        return None
+    left, datepart = line.split(colon, 1)
+    if isinstance(left, bytes):
+        left = left.decode("ascii")
+    return left.strip(), datepart.strip().split(slash)
+
+@mtime_cached
 def parse_list_txt(path: Path) -> List[Tuple[str, Optional[int], Optional[int], Optional[int]]]:
     """
     Reads lines of form:
@@ -118,44 +458,44 @@ def parse_list_txt(path: Path) -> List[Tuple[str, Optional[int], Optional[int],
     if not path.exists():
         return result
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.lower().startswith("name:birthday"):
-                    continue
-                if ":" not in line:
-                    continue
-                name, birthday = line.split(":", 1)
-                name = name.strip()
-                parts = birthday.strip().split("/")
-                day = month = year = None
-                if len(parts) >= 2:
+        for raw in path.read_bytes().split(b"\n"):
+            entry = split_entry_line(raw, "name:birthday")
+            if entry is None:
+                continue
+            name, parts = entry
+            day = month = year = None
+            if len(parts) >= 2:
+                try:
+                    day = int(parts[0])
+                    month = int(parts[1])
+                except Exception:
+                    day = month = None
+                if len(parts) >= 3:
                     try:
-                        day = int(parts[0])
-                        month = int(parts[1])
+                        year = int(parts[2])
                     except Exception:
-                        day = month = None
-                    if len(parts) >= 3:
-                        try:
-                            year = int(parts[2])
-                        except Exception:
-                            year = None
-                if name and day and month:
-                    result.append((name, day, month, year))
+                        year = None
+            if name and day and month:
+                result.append((name, day, month, year))
     except Exception as e:
         logging.error(f"Error reading list.txt: {e}")
     return result
 
+@mtime_cached
+def birthday_index(path: Path) -> Dict[Tuple[int, int], List[Tuple[str, Optional[int], Optional[int], Optional[int]]]]:
+    """Entries of parse_list_txt grouped by (month, day)."""
+    idx: Dict[Tuple[int, int], List[Tuple[str, Optional[int], Optional[int], Optional[int]]]] = {}
+    for entry in parse_list_txt(path):
+        _name, day, month, _year = entry
+        idx.setdefault((month, day), []).append(entry)
+    return idx
+
 def birthdays_today_ist() -> List[str]:
     today = now_ist()
-    d = today.day
-    m = today.month
-    matches = []
-    for (name, day, month, year) in parse_list_txt(LIST_FILE):
-        if day == d and month == m:
-            matches.append(name)
-    return matches
+    entries = birthday_index(LIST_FILE).get((today.month, today.day), [])
+    return [name for (name, _day, _month, _year) in entries]
 
+@mtime_cached
 def parse_anniversaries_txt(path: Path) -> List[Tuple[str, str, Optional[int], Optional[int], Optional[int]]]:
     """
     Reads lines of form:
@@ -169,49 +509,52 @@ def parse_anniversaries_txt(path: Path) -> List[Tuple[str, str, Optional[int], O
     if not path.exists():
         return result
     try:
-        with path.open("r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.lower().startswith("names:anniversary"):
-                    continue
-                if ":" not in line:
-                    continue
-                left, datepart = line.split(":", 1)
-                parts = re.split(r"\s*&\s*|\s*-\s*|\s+and\s+", left.strip(), maxsplit=1)
-                if len(parts) < 2:
-                    continue
-                n1 = parts[0].strip()
-                n2 = parts[1].strip()
-                dmy = datepart.strip().split("/")
-                day = month = year = None
-                if len(dmy) >= 2:
+        for raw in path.read_bytes().split(b"\n"):
+            entry = split_entry_line(raw, "names:anniversary")
+            if entry is None:
+                continue
+            left, dmy = entry
+            parts = _ANNIV_SEP_RE.split(left, maxsplit=1)
+            if len(parts) < 2:
+                continue
+            n1 = parts[0].strip()
+            n2 = parts[1].strip()
+            day = month = year = None
+            if len(dmy) >= 2:
+                try:
+                    day = int(dmy[0]); month = int(dmy[1])
+                except Exception:
+                    day = month = None
+                if len(dmy) >= 3:
                     try:
-                        day = int(dmy[0]); month = int(dmy[1])
+                        year = int(dmy[2])
                     except Exception:
-                        day = month = None
-                    if len(dmy) >= 3:
-                        try:
-                            year = int(dmy[2])
-                        except Exception:
-                            year = None
-                if n1 and n2 and day and month:
-                    result.append((n1, n2, day, month, year))
+                        year = None
+            if n1 and n2 and day and month:
+                result.append((n1, n2, day, month, year))
     except Exception as e:
         logging.error(f"Error reading anniversaries.txt: {e}")
     return result
 
+@mtime_cached
+def anniversary_index(path: Path) -> Dict[Tuple[int, int], List[Tuple[str, str, Optional[int], Optional[int], Optional[int]]]]:
+    """Entries of parse_anniversaries_txt grouped by (month, day)."""
+    idx: Dict[Tuple[int, int], List[Tuple[str, str, Optional[int], Optional[int], Optional[int]]]] = {}
+    for entry in parse_anniversaries_txt(path):
+        _n1, _n2, day, month, _year = entry
+        idx.setdefault((month, day), []).append(entry)
+    return idx
+
 def anniversaries_today_ist() -> List[Dict[str, Any]]:
     today = now_ist()
-    d = today.day
-    m = today.month
     y = today.year
     matches: List[Dict[str, Any]] = []
-    for (n1, n2, day, month, year) in parse_anniversaries_txt(ANNIVERSARIES_FILE):
-        if day == d and month == m:
-            years = None
-            if year and year > 1900 and y >= year:
-                years = y - year
-            matches.append({"names": [n1, n2], "year": year, "years": years})
+    for (n1, n2, _day, _month, year) in anniversary_index(ANNIVERSARIES_FILE).get((today.month, today.day), []):
+        # years depends on the current year, so it is computed per call rather than indexed
+        years = None
+        if year and year > 1900 and y >= year:
+            years = y - year
+        matches.append({"names": [n1, n2], "year": year, "years": years})
     return matches
 
 # -------- Retry wrappers --------
@@ -225,6 +568,9 @@ def with_retries(fn: Callable, max_attempts=3, base_delay=0.8, jitter=0.4):
             except Exception as e:
                 last_exc = e
                 attempt += 1
+                if attempt >= max_attempts:
+                    logging.warning(f"{fn.__name__} failed (attempt {attempt}/{max_attempts}): {e}; giving up")
+                    break
                 sleep_for = base_delay * (2 ** (attempt - 1)) + random.uniform(0, jitter)
                 logging.warning(f"{fn.__name__} failed (attempt {attempt}/{max_attempts}): {e}; retrying in {sleep_for:.2f}s")
                 time.sleep(sleep_for)
@@ -235,6 +581,32 @@ def with_retries(fn: Callable, max_attempts=3, base_delay=0.8, jitter=0.4):
 def serp_api_key() -> Optional[str]:
     return os.environ.get("SERPAPI_API_KEY")
 
+def serp_containers(r: requests.Response, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Pull only the given top-level result arrays out of a SERP response.
+    With ijson the body is stream-parsed and only objects under those keys
+    are materialized; otherwise the whole document is loaded.
+    """
+    if ijson is None:
+        data = r.json()
+        return {k: data.get(k) or [] for k in keys}
+    r.raw.decode_content = True
+    prefixes = {f"{k}.item": k for k in keys}
+    out: Dict[str, List[Dict[str, Any]]] = {k: [] for k in keys}
+    builder = None
+    current = ""
+    for prefix, event, value in ijson.parse(r.raw, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event == "end_map" and prefix == current:
+                out[prefixes[current]].append(builder.value)
+                builder = None
+        elif event == "start_map" and prefix in prefixes:
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            current = prefix
+    return out
+
 @with_retries
 def serp_search(query: str, num: int = 10, tbm: Optional[str] = None, tbs: Optional[str] = None) -> List[Dict[str, Any]]:
     api_key = serp_api_key()
@@ -252,17 +624,14 @@ def serp_search(query: str, num: int = 10, tbm: Optional[str] = None, tbs: Optio
         params["tbm"] = tbm
     if tbs:
         params["tbs"] = tbs
-    r = requests.get("https://serpapi.com/search.json", params=params, timeout=20)
-    if r.status_code != 200:
-        raise RuntimeError(f"SERPAPI non-200: {r.status_code} {r.text[:180]}")
-    data = r.json()
-    results: List[Dict[str, Any]] = []
     # Prefer specialized containers if present
-    containers = []
-    if tbm == "nws":
-        containers.append(data.get("news_results") or [])
-    containers.append(data.get("organic_results") or [])
-    for cont in containers:
+    keys = ["news_results", "organic_results"] if tbm == "nws" else ["organic_results"]
+    with _SESSION.get("https://serpapi.com/search.json", params=params, timeout=20, stream=True) as r:
+        if r.status_code != 200:
+            raise RuntimeError(f"SERPAPI non-200: {r.status_code} {r.text[:180]}")
+        data = serp_containers(r, keys)
+    results: List[Dict[str, Any]] = []
+    for cont in data.values():
         for item in cont:
             title = item.get("title") or ""
             link = item.get("link") or item.get("url") or ""
@@ -279,24 +648,34 @@ def serp_search(query: str, num: int = 10, tbm: Optional[str] = None, tbs: Optio
     return uniq[:num]
 
 # -------- Cohere helpers --------
+# One SDK client per process, rebuilt only if the API key changes
+_COHERE_STATE: Dict[str, Any] = {"key": None, "client": None}
+
 def cohere_client() -> "cohere.Client":
     key = os.environ.get("COHERE_API_KEY")
     if not key:
         raise RuntimeError("COHERE_API_KEY not set")
     if not cohere:
         raise RuntimeError("cohere python package not installed")
-    return cohere.Client(key)
+    if _COHERE_STATE["client"] is None or _COHERE_STATE["key"] != key:
+        _COHERE_STATE["client"] = cohere.Client(key)
+        _COHERE_STATE["key"] = key
+    return _COHERE_STATE["client"]
+
+_JSON_DECODER = json.JSONDecoder()
 
 def try_parse_json(text: str) -> Optional[Dict[str, Any]]:
-    # Extract first JSON object in text
+    # Decode the JSON object starting at the first "{"; trailing commentary is ignored.
+    # A malformed object is rejected outright (no retry from a nested "{"), so the
+    # caller retries instead of accepting an inner fragment.
+    start = text.find("{")
+    if start == -1:
+        return None
     try:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            return json.loads(text[start:end+1])
-    except Exception:
-        pass
-    return None
+        obj, _end = _JSON_DECODER.raw_decode(text, start)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
 
 @with_retries
 def cohere_chat_text(prompt: str, temperature: float = 0.3) -> str:
@@ -320,33 +699,112 @@ def cohere_chat_json(prompt: str, temperature: float = 0.2) -> Dict[str, Any]:
     return obj
 
 # -------- BookMyShow scraping helper --------
-@with_retries
-def fetch_bms_hindi_movies(url: str = "https://in.bookmyshow.com/explore/movies-mumbai?languages=hindi", max_items: int = 8) -> List[str]:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
-        "Accept-Language": "en-IN,en;q=0.9",
-    }
-    r = requests.get(url, headers=headers, timeout=20)
-    if r.status_code != 200:
-        raise RuntimeError(f"BMS non-200: {r.status_code}")
-    html = r.text
+def is_bms_movie_title(t: str) -> bool:
+    if not t or len(t) < 2:
+        return False
+    low = t.lower()
+    return not (low.startswith("bookmyshow") or low.startswith("explore"))
+
+def iter_json_titles(obj: Any):
+    # Yield every string stored under a "title" key, in document order
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if k == "title" and isinstance(v, str):
+                yield v
+            else:
+                yield from iter_json_titles(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from iter_json_titles(v)
+
+def bms_titles_from_tree(html: str) -> List[str]:
+    """Extract movie titles with selectolax: embedded script JSON first, then /movie/ anchors."""
+    tree = HTMLParser(html)
+    titles: List[str] = []
+
+    # Title fields in embedded JSON (ld+json, app state blobs)
+    for node in tree.css("script"):
+        text = node.text(deep=True)
+        if '"title"' not in text:
+            continue
+        try:
+            found = list(iter_json_titles(orjson.loads(text)))
+        except Exception:
+            # Not pure JSON (e.g. `window.__STATE__ = {...}`); scan just this script
+            found = [m.group(1) for m in _BMS_TITLE_RE.finditer(text)]
+        titles.extend(t.strip() for t in found if is_bms_movie_title(t.strip()))
+
+    # Fallback to anchor text of movie links
+    if len(titles) < 3:
+        for node in tree.css('a[href*="/movie/"]'):
+            # First non-blank text segment; leading whitespace-only nodes come back as empty segments
+            segments = node.text(deep=True, separator="\n", strip=True).split("\n")
+            first_text = next((seg for seg in segments if seg.strip()), "")
+            t = _WS_RE.sub(" ", first_text).strip()
+            if 2 <= len(t) <= 100 and t not in titles:
+                titles.append(t)
+    return titles
+
+def first_text_after(html: str, pos: int, end: int) -> str:
+    """
+    Text of the first non-blank '>...<' run in html[pos:end]. A linear
+    str.find scan, so unclosed tags can't cause backtracking.
+    """
+    gt = html.find(">", pos, end)
+    while gt != -1:
+        lt = html.find("<", gt + 1, end)
+        if lt == -1:
+            lt = end
+        raw = html[gt + 1:lt]
+        if raw.strip():
+            return raw
+        if lt >= end:
+            break
+        gt = html.find(">", lt, end)
+    return ""
+
+def bms_titles_from_regex(html: str) -> List[str]:
+    """Regex-only extraction, used when selectolax is not installed."""
     titles: List[str] = []
 
     # Try JSON-like title fields embedded in the HTML
-    for m in re.finditer(r'"title"\s*:\s*"([^"]+)"', html):
+    for m in _BMS_TITLE_RE.finditer(html):
         t = m.group(1).strip()
-        if not t or len(t) < 2:
-            continue
-        if t.lower().startswith("bookmyshow") or t.lower().startswith("explore"):
-            continue
-        titles.append(t)
+        if is_bms_movie_title(t):
+            titles.append(t)
 
     # Fallback to anchor text around movie URLs
+    # Each scan stops at the link's closing tag or the next movie href, whichever
+    # comes first; the closer pointer only moves forward, so the pass stays linear.
     if len(titles) < 3:
-        for m in re.finditer(r'href="[^"]*/movie/[^"]*".*?>([^<]{2,100})<', html, re.IGNORECASE | re.DOTALL):
-            t = re.sub(r"\s+", " ", m.group(1)).strip()
+        hrefs = list(_BMS_HREF_RE.finditer(html))
+        close = -1
+        for i, m in enumerate(hrefs):
+            if close != len(html) and close < m.end():
+                c = _BMS_CLOSE_A_RE.search(html, m.end())
+                close = c.start() if c else len(html)
+            end = min(close, hrefs[i + 1].start() if i + 1 < len(hrefs) else len(html))
+            raw = first_text_after(html, m.end(), end)
+            if not 2 <= len(raw) <= 100:
+                continue
+            t = _WS_RE.sub(" ", raw).strip()
             if t and t not in titles:
                 titles.append(t)
+    return titles
+
+@with_retries
+def fetch_bms_hindi_movies(url: str = "https://in.bookmyshow.com/explore/movies-mumbai?languages=hindi", max_items: int = 8) -> List[str]:
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+        "Accept-Language": "en-IN,en;q=0.9",
+    }
+    r = _SESSION.get(url, headers=headers, timeout=20)
+    if r.status_code != 200:
+        raise RuntimeError(f"BMS non-200: {r.status_code}")
+    if HTMLParser is not None:
+        titles = bms_titles_from_tree(r.text)
+    else:
+        titles = bms_titles_from_regex(r.text)
 
     # Deduplicate preserving order
     seen = set()
@@ -519,11 +977,8 @@ def gen_friday_movies() -> Tuple[str, Dict[str, Any]]:
 
 
 def gen_friday_riddle() -> Tuple[str, Dict[str, Any]]:
-    serp_results = []
-    try:
-        serp_results = serp_search("emoji riddles India family friendly", num=8, tbs="qdr:y")
-    except Exception as e:
-        logging.warning(f"SERP for riddles failed: {e}")
+    # The prompt does not depend on SERP, so run it alongside the Cohere call
+    serp_future = worker_pool().submit(serp_search, "emoji riddles India family friendly", num=8, tbs="qdr:y")
 
     prompt = f"""
 Create one great riddle for an Indian audience. Prefer emoji-style if possible, else a clever text riddle. Difficulty: medium. Return also the answer.
@@ -537,6 +992,11 @@ Return JSON:
 {{"riddle":"", "answer":"", "type":"emoji|text"}}
 """
     data = cohere_chat_json(prompt, temperature=0.7)
+    serp_results = []
+    try:
+        serp_results = serp_future.result(timeout=SERP_JOIN_TIMEOUT)
+    except Exception as e:
+        logging.warning(f"SERP for riddles failed: {e}")
     riddle = str(data.get("riddle", "")).strip()
     answer = str(data.get("answer", "")).strip()
     rtype = str(data.get("type", "text")).strip()
@@ -608,7 +1068,21 @@ def generate_for_day(day: str) -> Dict[str, Any]:
     return payload
 
 # -------- Flask app --------
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (compact output, no key sorting)."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+def json_response(obj: Any) -> Response:
+    # Serialize straight to bytes; skips the str decode/re-encode of app.json.response
+    return app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json")
 
 def check_token() -> Optional[str]:
     expected = os.environ.get("APP_TOKEN")
@@ -649,69 +1123,73 @@ def build_error_response(code: str, message: str) -> Dict[str, Any]:
         "error_message": message
     }
 
+def generate_daily(birthdays: List[str], anniversaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate today's full /daily payload (not cached here)."""
+    generated = generate_for_day(weekday_ist_str())
+    # Prepend birthdays/anniversaries to message if any
+    header_lines: List[str] = []
+    if birthdays:
+        bmsg = "🎉 Birthdays today: " + ", ".join(birthdays)
+        header_lines.append(bmsg)
+    if anniversaries:
+        pairs = []
+        for a in anniversaries:
+            names = " & ".join(a.get("names", []))
+            yrs = a.get("years")
+            if yrs:
+                names += f" ({yrs} yrs)"
+            pairs.append(names)
+        amsg = "💍 Anniversaries today: " + ", ".join(pairs)
+        header_lines.append(amsg)
+    if header_lines:
+        base_msg = generated.get("message", "")
+        generated["message"] = f"{'\n'.join(header_lines)}\n\n{base_msg}"
+    return build_success_response(generated, cache_hit=False, birthdays=birthdays, anniversaries=anniversaries)
+
 @app.get("/health")
 def health():
-    return jsonify({"ok": True, "version": APP_VERSION})
+    return json_response({"ok": True, "version": APP_VERSION})
 
 @app.get("/daily")
 def daily():
     # Optional token check
     auth_err = check_token()
     if auth_err:
-        return jsonify(build_error_response("AUTH", "Unauthorized")), 200
+        return json_response(build_error_response("AUTH", "Unauthorized")), 200
 
-    # Serve cached payload if exists
-    cache = get_cache()
     today = today_str_ist()
     birthdays = birthdays_today_ist()
     anniversaries = anniversaries_today_ist()
 
-    if today in cache:
-        payload = cache[today]
-        # Always attach latest birthdays (not stored in cache to avoid staleness if list.txt changes midday)
-        payload["birthdays_today"] = birthdays
-        # Always attach latest anniversaries too
-        payload["anniversaries_today"] = anniversaries
-        # Mark as cache hit for client visibility
-        payload["cache_hit"] = True
-        return jsonify(payload), 200
+    # Serve cached payload if exists (memoized in-process; disk is only stat'ed)
+    if load_today_memo(today):
+        return today_response(birthdays, anniversaries)
 
     # Generate fresh
     try:
-        day = weekday_ist_str()
-        generated = generate_for_day(day)
-        # Prepend birthdays/anniversaries to message if any
-        header_lines: List[str] = []
-        if birthdays:
-            bmsg = "🎉 Birthdays today: " + ", ".join(birthdays)
-            header_lines.append(bmsg)
-        if anniversaries:
-            pairs = []
-            for a in anniversaries:
-                names = " & ".join(a.get("names", []))
-                yrs = a.get("years")
-                if yrs:
-                    names += f" ({yrs} yrs)"
-                pairs.append(names)
-            amsg = "💍 Anniversaries today: " + ", ".join(pairs)
-            header_lines.append(amsg)
-        if header_lines:
-            base_msg = generated.get("message", "")
-            generated["message"] = f"{'\n'.join(header_lines)}\n\n{base_msg}"
-        final = build_success_response(generated, cache_hit=False, birthdays=birthdays, anniversaries=anniversaries)
-        # Cache for rest of the day
-        set_cache(today, final)
-        return jsonify(final), 200
+        with generation_lock(timeout=GENERATION_LOCK_WAIT) as acquired:
+            # Another worker or the warmer may have generated it while we waited
+            if load_today_memo(today):
+                return today_response(birthdays, anniversaries)
+            if not acquired:
+                # Don't queue behind a slow or failing generation; do our own
+                logging.warning("Timed out waiting for another worker's generation; generating unlocked")
+            final = generate_daily(birthdays, anniversaries)
+            resp = json_response(final)
+            # Cache for rest of the day; only memoize what actually reached disk
+            if set_cache(today, final):
+                memo_today(today, final)
+        return resp, 200
     except Exception as e:
         logging.exception("Failed to generate daily content")
         # Robust fallback to ensure Shortcuts gets a valid JSON
         fallback = build_error_response("GENERATION_FAILED", str(e)[:300])
-        return jsonify(fallback), 200
+        return json_response(fallback), 200
 
 # -------- Utility admin/test endpoints (token required for mutating ops) --------
 @app.get("/version")
 def version():
-    return jsonify({
+    return json_response({
         "ok": True,
         "version": APP_VERSION,
         "date_ist": today_str_ist(),
@@ -721,7 +1199,7 @@ def version():
 @app.get("/schema")
 def schema():
     # Minimal schema description for Apple Shortcuts reference
-    return jsonify({
+    return json_response({
         "success": "boolean",
         "version": "string",
         "date_ist": "YYYY-MM-DD (IST)",
@@ -743,7 +1221,7 @@ def preview():
     # Preview generation for a specified day without caching (requires token)
     auth_err = check_token()
     if auth_err:
-        return jsonify(build_error_response("AUTH", "Unauthorized")), 200
+        return json_response(build_error_response("AUTH", "Unauthorized")), 200
 
     day = (request.args.get("day") or weekday_ist_str()).upper().strip()
     try:
@@ -773,25 +1251,84 @@ def preview():
             base_msg = generated.get("message","")
             generated["message"] = f"{'\n'.join(header_lines)}\n\n{base_msg}"
         final = build_success_response(generated, cache_hit=False, birthdays=bdays, anniversaries=anivs)
-        return jsonify(final), 200
+        return json_response(final), 200
     except Exception as e:
         logging.exception("Preview generation failed")
-        return jsonify(build_error_response("PREVIEW_FAILED", str(e)[:300])), 200
+        return json_response(build_error_response("PREVIEW_FAILED", str(e)[:300])), 200
 
 @app.get("/reset-cache")
 def reset_cache():
     # Clear the daily cache (requires token)
     auth_err = check_token()
     if auth_err:
-        return jsonify(build_error_response("AUTH", "Unauthorized")), 200
+        return json_response(build_error_response("AUTH", "Unauthorized")), 200
     try:
-        write_json_file(CACHE_FILE, {})
-        return jsonify({"ok": True, "cleared": True, "date_ist": today_str_ist()}), 200
+        clear_cache()
+        return json_response({"ok": True, "cleared": True, "date_ist": today_str_ist()}), 200
     except Exception as e:
-        return jsonify(build_error_response("RESET_FAILED", str(e)[:300])), 200
+        return json_response(build_error_response("RESET_FAILED", str(e)[:300])), 200
+
+# -------- Cache warmer --------
+# Shortly after midnight IST, generate the new day's payload so the first
+# /daily call is a cache hit. Disable with DAILY_WARMER=0.
+# Started from the first request in each process rather than at import, so
+# pre-fork servers run it in their workers and not only in the master.
+# Hosts whose web workers don't run background threads (PythonAnywhere's
+# uWSGI) should run `python app.py --warm` as a scheduled task instead.
+WARM_AFTER_MIDNIGHT = timedelta(minutes=5)
+_WARMER_STATE: Dict[str, Any] = {"pid": None}
+_WARMER_LOCK = threading.Lock()
+
+def seconds_until_next_warm(now: datetime) -> float:
+    target = now.replace(hour=0, minute=0, second=0, microsecond=0) + WARM_AFTER_MIDNIGHT
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+def warm_today() -> None:
+    """Generate and cache today's payload unless another worker has (or is doing) it."""
+    with generation_lock() as acquired:
+        if not acquired:
+            logging.info("Daily payload already being generated elsewhere; skipping warm-up")
+            return
+        today = today_str_ist()
+        if get_cached(today) is not None:
+            return
+        final = generate_daily(birthdays_today_ist(), anniversaries_today_ist())
+        if set_cache(today, final):
+            logging.info(f"Warmed daily cache for {today}")
+
+def warmer_loop() -> None:
+    while True:
+        time.sleep(seconds_until_next_warm(now_ist()))
+        try:
+            warm_today()
+        except Exception:
+            logging.exception("Cache warm-up failed")
+
+def start_warmer() -> None:
+    if os.environ.get("DAILY_WARMER", "1") == "0" or _WARMER_STATE["pid"] == os.getpid():
+        return
+    with _WARMER_LOCK:
+        if _WARMER_STATE["pid"] == os.getpid():
+            return
+        _WARMER_STATE["pid"] = os.getpid()
+        threading.Thread(target=warmer_loop, name="daily-warmer", daemon=True).start()
+
+@app.before_request
+def ensure_warmer() -> None:
+    start_warmer()
+
+# Prune stale cache files in the background on startup (one-off thread, so
+# nothing pool-related is created before a pre-fork server forks workers)
+threading.Thread(target=prune_cache, name="cache-prune", daemon=True).start()
 
 # -------- CLI entry --------
 if __name__ == "__main__":
+    if "--warm" in sys.argv[1:]:
+        # One-shot warm-up for a scheduled task at 00:05 IST
+        warm_today()
+        sys.exit(0)
     # Local run: FLASK_ENV=development python app.py
     port = int(os.environ.get("PORT", "5051"))
     app.run(host="0.0.0.0", port=port)